@@ -1,4 +1,5 @@
-from fastapi import FastAPI, APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -9,10 +10,22 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 import uuid
 from datetime import datetime
-import boto3
-import json
+from contextlib import AsyncExitStack
+import aioboto3
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from bson import ObjectId
+from bson.errors import InvalidId
+from aiobotocore.config import AioConfig
+from amazon_transcribe.client import TranscribeStreamingClient
+from amazon_transcribe.model import TranscriptEvent
+import orjson
 import asyncio
+import random
+import time
+import hashlib
 import aiofiles
+from anyio import to_thread
 import tempfile
 
 ROOT_DIR = Path(__file__).parent
@@ -29,29 +42,111 @@ aws_secret_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
 aws_region = os.environ.get('AWS_REGION', 'eu-central-1')
 s3_bucket_name = os.environ.get('S3_BUCKET_NAME', 'kaizen-voice-recordings')
 
-transcribe_client = boto3.client(
-    'transcribe',
+aws_session = aioboto3.Session(
     region_name=aws_region,
     aws_access_key_id=aws_access_key,
     aws_secret_access_key=aws_secret_key
 )
 
-bedrock_client = boto3.client(
-    'bedrock-runtime',
-    region_name=aws_region,
-    aws_access_key_id=aws_access_key,
-    aws_secret_access_key=aws_secret_key
+# Transcribe Streaming accepts Ogg/Opus directly; WebM still goes through a batch job
+transcribe_streaming_client = TranscribeStreamingClient(region=aws_region)
+OGG_MAGIC = b'OggS'
+STREAM_CHUNK_SIZE = 8 * 1024
+TRANSCRIPTION_TIMEOUT = 300  # seconds, for both streaming and batch jobs
+
+# Jobs still unfinished after this long lost their worker (restart or crash) and are marked failed
+JOB_STALE_AFTER = 2 * TRANSCRIPTION_TIMEOUT
+TERMINAL_JOB_STATUSES = ("completed", "failed")
+
+# Bedrock Claude settings. Prompt caching is only honoured by newer Claude models
+# and above a minimum prefix length, so it is opt-in.
+bedrock_model_id = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
+bedrock_prompt_cache = os.environ.get('BEDROCK_PROMPT_CACHE', 'false').lower() == 'true'
+
+# Static instructions, kept byte-identical across requests so Bedrock can cache them
+CLAUDE_SYSTEM_PROMPT = """Analyze the workplace improvement suggestion transcript and provide a structured analysis.
+
+Please categorize this suggestion according to Lean methodology and provide:
+1. A concise summary (2-3 sentences)
+2. Primary Lean waste category from: Motion, Waiting, Overproduction, Defects, Overprocessing, Inventory, Transportation
+3. Suggestion level: "Just Do It" (simple fix), "Needs Review" (requires approval), or "Safety" (safety concern)
+4. Brief reasoning for the categorization
+
+Record the analysis with the record_kaizen tool."""
+
+LEAN_CATEGORIES = ["Motion", "Waiting", "Overproduction", "Defects", "Overprocessing", "Inventory", "Transportation"]
+SUGGESTION_LEVELS = ["Just Do It", "Needs Review", "Safety"]
+
+# Forcing this tool makes Claude return the analysis as structured input, no JSON parsing needed
+CLAUDE_KAIZEN_TOOL = {
+    "name": "record_kaizen",
+    "description": "Record the structured Lean analysis of a Kaizen suggestion",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "summary": {"type": "string", "description": "Brief summary of the improvement suggestion"},
+            "lean_category": {"type": "string", "enum": LEAN_CATEGORIES},
+            "suggestion_level": {"type": "string", "enum": SUGGESTION_LEVELS},
+            "reasoning": {"type": "string", "description": "Brief explanation of why this fits the category and level"}
+        },
+        "required": ["summary", "lean_category", "suggestion_level", "reasoning"]
+    }
+}
+
+# Everything in the Bedrock request except the user message, built once at import
+CLAUDE_SYSTEM_BLOCK = {"type": "text", "text": CLAUDE_SYSTEM_PROMPT}
+if bedrock_prompt_cache:
+    CLAUDE_SYSTEM_BLOCK["cache_control"] = {"type": "ephemeral"}
+
+CLAUDE_REQUEST_BASE = {
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 1000,
+    "system": [CLAUDE_SYSTEM_BLOCK],
+    "tools": [CLAUDE_KAIZEN_TOOL],
+    "tool_choice": {"type": "tool", "name": CLAUDE_KAIZEN_TOOL["name"]}
+}
+
+# Serialized once; each request only encodes its user message and splices it in between
+CLAUDE_BODY_PREFIX = orjson.dumps(CLAUDE_REQUEST_BASE)[:-1] + b',"messages":['
+CLAUDE_BODY_SUFFIX = b']}'
+
+# Changes whenever the instructions, tool schema or request settings change, invalidating cached analyses
+CLAUDE_PROMPT_VERSION = hashlib.blake2b(CLAUDE_BODY_PREFIX, digest_size=8).hexdigest()
+
+# Cached analyses expire so they don't outlive the suggestions they were made for
+ANALYSIS_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+
+# Threadpool tokens per worker for sync work FastAPI offloads (UploadFile I/O, sync handlers).
+# AWS calls are async and don't hold a token; anyio's default of 40 is too small under bursts.
+thread_pool_size = int(os.environ.get('THREAD_POOL_SIZE', '128'))
+
+# Multipart upload settings: audio is streamed to S3 in 5 MiB parts. The reader outpaces S3,
+# so the part queue is kept small: at most ~7 parts (2 queued + 4 uploading + 1 being read) in memory.
+s3_transfer_config = TransferConfig(
+    multipart_threshold=5 * 1024 * 1024,
+    multipart_chunksize=5 * 1024 * 1024,
+    max_concurrency=4,
+    max_io_queue=2
 )
 
-s3_client = boto3.client(
-    's3',
-    region_name=aws_region,
-    aws_access_key_id=aws_access_key,
-    aws_secret_access_key=aws_secret_key
+# Shared by all AWS clients: a wider connection pool and adaptive retries
+aws_client_config = AioConfig(
+    max_pool_connections=64,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
 )
 
+# Long-lived async clients, opened on startup and closed on shutdown
+aws_exit_stack = AsyncExitStack()
+transcribe_client = None
+bedrock_client = None
+s3_client = None
+# Only set when the bucket is confirmed missing and couldn't be created; uploads then fail fast
+BUCKET_MISSING = False
+BUCKET_RECHECK_INTERVAL = 60  # seconds
+bucket_checked_at = 0.0
+
 # Create the main app without a prefix
-app = FastAPI(title="Kaizen Voice Recorder API")
+app = FastAPI(title="Kaizen Voice Recorder API", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -81,25 +176,37 @@ class ProcessingStatus(BaseModel):
     status: str
     message: str
 
+# AWS liveness is cached so health probes don't each hit the Transcribe API
+AWS_STATUS_TTL = 30  # seconds
+aws_status = {"value": "unknown", "ts": 0.0}
+aws_status_task = None
+
+async def refresh_aws_status():
+    """Check AWS credentials (quick test) and cache the result"""
+    try:
+        await transcribe_client.list_transcription_jobs(MaxResults=1)
+        value = "healthy"
+    except Exception as e:
+        value = f"error: {str(e)}"
+    aws_status.update(value=value, ts=time.monotonic())
+
 # Health check endpoint
 @api_router.get("/health")
 async def health_check():
+    global aws_status_task
     try:
         # Check MongoDB connection
         await db.command("ping")
         
-        # Check AWS credentials (quick test)
-        try:
-            transcribe_client.list_transcription_jobs(MaxResults=1)
-            aws_status = "healthy"
-        except Exception as e:
-            aws_status = f"error: {str(e)}"
+        # Refresh a stale AWS status in the background; the probe never waits on AWS
+        if time.monotonic() - aws_status["ts"] >= AWS_STATUS_TTL and (aws_status_task is None or aws_status_task.done()):
+            aws_status_task = asyncio.create_task(refresh_aws_status())
         
         return {
             "status": "healthy", 
             "timestamp": datetime.utcnow(),
             "mongodb": "connected",
-            "aws": aws_status
+            "aws": aws_status["value"]
         }
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Service unhealthy: {str(e)}")
@@ -108,31 +215,19 @@ async def health_check():
 async def root():
     return {"message": "Kaizen Voice Recorder API - Ready to capture your improvement ideas!"}
 
-async def upload_to_s3(audio_file: UploadFile, s3_key: str):
+async def upload_to_s3(audio_file: UploadFile, s3_key: str, content_type: str = 'audio/webm'):
     """Upload audio file to S3"""
     try:
-        # Create bucket if it doesn't exist
-        try:
-            s3_client.head_bucket(Bucket=s3_bucket_name)
-        except:
-            try:
-                s3_client.create_bucket(
-                    Bucket=s3_bucket_name,
-                    CreateBucketConfiguration={'LocationConstraint': aws_region}
-                )
-            except Exception as e:
-                logging.warning(f"Could not create bucket: {e}")
-        
         # Reset file pointer to beginning
         await audio_file.seek(0)
-        content = await audio_file.read()
-        
-        # Upload to S3
-        s3_client.put_object(
-            Bucket=s3_bucket_name,
-            Key=s3_key,
-            Body=content,
-            ContentType='audio/webm'
+        
+        # Stream to S3 (UploadFile.read is async, so the loop is never blocked)
+        await s3_client.upload_fileobj(
+            audio_file,
+            s3_bucket_name,
+            s3_key,
+            ExtraArgs={'ContentType': content_type},
+            Config=s3_transfer_config
         )
         
         return f"s3://{s3_bucket_name}/{s3_key}"
@@ -144,7 +239,7 @@ async def start_transcription_job(job_name: str, s3_uri: str) -> str:
     """Start AWS Transcribe job and wait for completion"""
     try:
         # Start transcription job
-        transcribe_client.start_transcription_job(
+        await transcribe_client.start_transcription_job(
             TranscriptionJobName=job_name,
             Media={'MediaFileUri': s3_uri},
             MediaFormat='webm',
@@ -153,13 +248,14 @@ async def start_transcription_job(job_name: str, s3_uri: str) -> str:
             OutputKey=f"transcripts/{job_name}.json"
         )
         
-        # Poll for completion (with timeout)
-        max_wait_time = 300  # 5 minutes max
-        poll_interval = 5  # Check every 5 seconds
+        # Poll for completion (with timeout), backing off 1s, 1.5s, 2.25s... up to 10s
+        max_wait_time = TRANSCRIPTION_TIMEOUT
+        poll_interval = 1.0
+        max_poll_interval = 10.0
         waited_time = 0
         
         while waited_time < max_wait_time:
-            response = transcribe_client.get_transcription_job(
+            response = await transcribe_client.get_transcription_job(
                 TranscriptionJobName=job_name
             )
             status = response['TranscriptionJob']['TranscriptionJobStatus']
@@ -169,11 +265,12 @@ async def start_transcription_job(job_name: str, s3_uri: str) -> str:
                 transcript_key = f"transcripts/{job_name}.json"
                 
                 try:
-                    transcript_obj = s3_client.get_object(
+                    transcript_obj = await s3_client.get_object(
                         Bucket=s3_bucket_name,
                         Key=transcript_key
                     )
-                    transcript_data = json.loads(transcript_obj['Body'].read())
+                    async with transcript_obj['Body'] as stream:
+                        transcript_data = orjson.loads(await stream.read())
                     return transcript_data['results']['transcripts'][0]['transcript']
                 except Exception as e:
                     raise Exception(f"Failed to download transcript: {str(e)}")
@@ -182,71 +279,151 @@ async def start_transcription_job(job_name: str, s3_uri: str) -> str:
                 failure_reason = response['TranscriptionJob'].get('FailureReason', 'Unknown error')
                 raise Exception(f"Transcription job failed: {failure_reason}")
                 
-            # Wait before polling again
-            await asyncio.sleep(poll_interval)
-            waited_time += poll_interval
+            # Wait before polling again, with jitter so concurrent jobs don't poll in lockstep
+            delay = poll_interval + random.uniform(0, 0.25)
+            await asyncio.sleep(delay)
+            waited_time += delay
+            poll_interval = min(poll_interval * 1.5, max_poll_interval)
             
         raise Exception("Transcription job timed out")
         
     except Exception as e:
         raise Exception(f"Transcription failed: {str(e)}")
 
+async def is_streamable(audio_file: UploadFile) -> bool:
+    """Whether the upload is Ogg/Opus and can be sent to Transcribe Streaming as-is.
+
+    Browsers mislabel recordings (react-media-recorder tags every blob audio/wav),
+    so the container is detected from its magic bytes rather than the content type.
+    """
+    await audio_file.seek(0)
+    header = await audio_file.read(len(OGG_MAGIC))
+    await audio_file.seek(0)
+    return header == OGG_MAGIC
+
+async def stream_transcription(s3_key: str) -> str:
+    """Transcribe archived Ogg/Opus audio with AWS Transcribe Streaming"""
+    try:
+        audio_obj = await s3_client.get_object(Bucket=s3_bucket_name, Key=s3_key)
+        stream = await transcribe_streaming_client.start_stream_transcription(
+            language_code='en-US',
+            media_sample_rate_hz=48000,
+            media_encoding='ogg-opus'
+        )
+        segments = []
+
+        async def send_audio():
+            async with audio_obj['Body'] as body:
+                while chunk := await body.read(STREAM_CHUNK_SIZE):
+                    await stream.input_stream.send_audio_event(audio_chunk=chunk)
+            await stream.input_stream.end_stream()
+
+        async def receive_transcript():
+            async for event in stream.output_stream:
+                if not isinstance(event, TranscriptEvent):
+                    continue
+                for result in event.transcript.results:
+                    if not result.is_partial and result.alternatives:
+                        segments.append(result.alternatives[0].transcript)
+
+        try:
+            async with asyncio.timeout(TRANSCRIPTION_TIMEOUT):
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(send_audio())
+                    tg.create_task(receive_transcript())
+        except ExceptionGroup as eg:
+            # Surface the task's own error rather than "unhandled errors in a TaskGroup"
+            raise eg.exceptions[0]
+
+        return " ".join(segments)
+
+    except TimeoutError:
+        raise Exception("Streaming transcription timed out")
+    except Exception as e:
+        raise Exception(f"Streaming transcription failed: {str(e)}")
+
+def analysis_cache_key(transcript: str, metadata: dict) -> str:
+    """Hash of everything that shapes the analysis: model, prompt version, transcript and context.
+
+    Case and whitespace differences in the transcript and context are ignored.
+    """
+    def normalize(text) -> str:
+        return " ".join(str(text or "").lower().split())
+
+    parts = [bedrock_model_id, CLAUDE_PROMPT_VERSION, normalize(transcript)]
+    parts += [normalize(metadata.get(field)) for field in ("location", "shift", "associate_name")]
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+def validate_analysis(analysis) -> dict:
+    """Check a record_kaizen tool input against its schema, which Claude 3 doesn't strictly enforce"""
+    if not isinstance(analysis, dict):
+        raise ValueError("Analysis is not an object")
+    
+    required = CLAUDE_KAIZEN_TOOL["input_schema"]["required"]
+    missing = [key for key in required if not isinstance(analysis.get(key), str) or not analysis[key].strip()]
+    if missing:
+        raise ValueError(f"Analysis is missing {', '.join(missing)}")
+    if analysis["lean_category"] not in LEAN_CATEGORIES:
+        raise ValueError(f"Unknown lean_category: {analysis['lean_category']}")
+    if analysis["suggestion_level"] not in SUGGESTION_LEVELS:
+        raise ValueError(f"Unknown suggestion_level: {analysis['suggestion_level']}")
+    
+    return analysis
+
+async def get_cached_analysis(cache_key: str) -> Optional[dict]:
+    """Look up a previous Claude analysis of the same transcript"""
+    try:
+        cached = await db.analysis_cache.find_one({"_id": cache_key})
+        return validate_analysis(cached["analysis"]) if cached else None
+    except Exception as e:
+        # Invalid entries count as a miss and are overwritten by the fresh analysis
+        logging.warning(f"Analysis cache lookup failed: {str(e)}")
+        return None
+
+async def cache_analysis(cache_key: str, analysis: dict):
+    """Store a successful Claude analysis for reuse"""
+    try:
+        await db.analysis_cache.update_one(
+            {"_id": cache_key},
+            {"$set": {"analysis": analysis, "timestamp": datetime.utcnow()}},
+            upsert=True
+        )
+    except Exception as e:
+        logging.warning(f"Analysis cache store failed: {str(e)}")
+
 async def analyze_with_claude(transcript: str, metadata: dict) -> dict:
     """Analyze transcript with Claude 3 Sonnet for Lean categorization"""
+    # Repeated suggestions skip Bedrock entirely
+    cache_key = analysis_cache_key(transcript, metadata)
+    cached = await get_cached_analysis(cache_key)
+    if cached is not None:
+        logging.info(f"Analysis cache hit: {cache_key}")
+        return cached
+    
     try:
-        prompt = f"""
-        Analyze this workplace improvement suggestion transcript and provide a structured analysis.
-        
-        TRANSCRIPT: "{transcript}"
-        CONTEXT:
-        - Location: {metadata.get('location', 'Not specified')}
-        - Shift: {metadata.get('shift', 'Not specified')}
-        - Associate: {metadata.get('associate_name', 'Not specified')}
-        
-        Please categorize this suggestion according to Lean methodology and provide:
-        1. A concise summary (2-3 sentences)
-        2. Primary Lean waste category from: Motion, Waiting, Overproduction, Defects, Overprocessing, Inventory, Transportation
-        3. Suggestion level: "Just Do It" (simple fix), "Needs Review" (requires approval), or "Safety" (safety concern)
-        4. Brief reasoning for the categorization
-        
-        Respond ONLY in valid JSON format:
-        {{
-            "summary": "Brief summary of the improvement suggestion",
-            "lean_category": "Primary lean waste category",
-            "suggestion_level": "Just Do It|Needs Review|Safety",
-            "reasoning": "Brief explanation of why this fits the category and level"
-        }}
-        """
-
-        response = bedrock_client.invoke_model(
-            modelId='anthropic.claude-3-sonnet-20240229-v1:0',
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            })
+        prompt = f"""TRANSCRIPT: "{transcript}"
+CONTEXT:
+- Location: {metadata.get('location', 'Not specified')}
+- Shift: {metadata.get('shift', 'Not specified')}
+- Associate: {metadata.get('associate_name', 'Not specified')}"""
+
+        response = await bedrock_client.invoke_model(
+            modelId=bedrock_model_id,
+            body=CLAUDE_BODY_PREFIX + orjson.dumps({
+                "role": "user",
+                "content": [{"type": "text", "text": prompt}]
+            }) + CLAUDE_BODY_SUFFIX
         )
         
-        response_body = json.loads(response['body'].read())
-        content = response_body['content'][0]['text']
+        async with response['body'] as stream:
+            response_body = orjson.loads(await stream.read())
+        for block in response_body['content']:
+            if block.get('type') == 'tool_use' and block.get('name') == CLAUDE_KAIZEN_TOOL["name"]:
+                analysis = validate_analysis(block['input'])
+                await cache_analysis(cache_key, analysis)
+                return analysis
         
-        # Parse JSON response from Claude
-        try:
-            analysis = json.loads(content)
-            return analysis
-        except json.JSONDecodeError as e:
-            # Fallback if Claude doesn't return valid JSON
-            return {
-                "summary": transcript[:200] + "..." if len(transcript) > 200 else transcript,
-                "lean_category": "Motion",
-                "suggestion_level": "Needs Review",
-                "reasoning": f"AI analysis failed, manual review needed. Error: {str(e)}"
-            }
+        raise Exception(f"No {CLAUDE_KAIZEN_TOOL['name']} tool call in response")
         
     except Exception as e:
         logging.error(f"Claude analysis failed: {str(e)}")
@@ -282,84 +459,218 @@ async def store_suggestion(job_id: str, transcript: str, analysis: dict, metadat
     except Exception as e:
         raise Exception(f"Database storage failed: {str(e)}")
 
-@api_router.post("/transcribe", response_model=dict)
+async def update_job(job_id: str, **fields):
+    """Record pipeline progress on the job document"""
+    await db.kaizen_jobs.update_one(
+        {"id": job_id},
+        {"$set": {**fields, "last_updated": datetime.utcnow()}}
+    )
+
+async def run_pipeline(job_id: str, s3_key: str, streaming: bool, meta_data: dict):
+    """Background pipeline: transcribe + AI analysis + storage"""
+    try:
+        await update_job(job_id, status="transcribing")
+        if streaming:
+            transcription_result = await stream_transcription(s3_key)
+        else:
+            transcription_result = await start_transcription_job(job_id, f"s3://{s3_bucket_name}/{s3_key}")
+        logging.info(f"Transcription completed: {len(transcription_result)} characters")
+        
+        # Process with Bedrock Claude
+        await update_job(job_id, status="analyzing")
+        analysis_result = await analyze_with_claude(transcription_result, meta_data)
+        logging.info(f"AI analysis completed: {analysis_result['lean_category']}")
+        
+        # Store in MongoDB
+        document_id = await store_suggestion(job_id, transcription_result, analysis_result, meta_data)
+        logging.info(f"Stored in database: {document_id}")
+        
+        await update_job(job_id, status="completed", result={
+            "document_id": document_id,
+            "transcript": transcription_result,
+            "summary": analysis_result["summary"],
+            "lean_category": analysis_result["lean_category"],
+            "suggestion_level": analysis_result["suggestion_level"],
+            "reasoning": analysis_result.get("reasoning", "")
+        })
+        
+    except Exception as e:
+        logging.error(f"Processing failed for {job_id}: {str(e)}")
+        try:
+            await update_job(job_id, status="failed", error=str(e))
+        except Exception as db_error:
+            logging.error(f"Failed to record job failure for {job_id}: {str(db_error)}")
+
+@api_router.post("/transcribe", response_model=dict, status_code=202)
 async def process_voice_recording(
+    background_tasks: BackgroundTasks,
     audio: UploadFile = File(...),
-    metadata: str = Form(default='{}')
+    location: Optional[str] = Form(None),
+    shift: Optional[str] = Form(None),
+    associate_name: Optional[str] = Form(None)
 ):
-    """Process voice recording: transcribe + AI analysis + storage"""
+    """Accept a voice recording and queue transcription + AI analysis + storage.
+
+    Poll GET /api/jobs/{job_id} for the result.
+    """
     try:
-        # Parse metadata
-        try:
-            meta_data = json.loads(metadata)
-        except json.JSONDecodeError:
-            meta_data = {}
+        meta_data = KaizenSuggestionCreate(
+            location=location,
+            shift=shift,
+            associate_name=associate_name
+        ).model_dump(exclude_none=True)
         
         # Validate audio file
         if not audio.filename:
             raise HTTPException(status_code=400, detail="No audio file provided")
         
+        # Fail fast if the bucket is known to be missing, re-checking at most once per interval
+        if BUCKET_MISSING:
+            if time.monotonic() - bucket_checked_at >= BUCKET_RECHECK_INTERVAL:
+                await ensure_s3_bucket()
+            if BUCKET_MISSING:
+                raise HTTPException(status_code=503, detail="Audio storage is unavailable")
+        
         # Generate unique identifiers
         job_id = f"kaizen_{uuid.uuid4().hex[:8]}"
-        s3_key = f"audio/{job_id}.webm"
+        streaming = await is_streamable(audio)
+        if streaming:
+            s3_key, content_type = f"audio/{job_id}.ogg", 'audio/ogg'
+        else:
+            s3_key, content_type = f"audio/{job_id}.webm", 'audio/webm'
         
         logging.info(f"Processing audio job: {job_id}")
         
-        # Upload audio to S3
-        s3_uri = await upload_to_s3(audio, s3_key)
+        # Upload audio to S3 while the request still owns the file, recording the job meanwhile
+        s3_uri, job_insert = await asyncio.gather(
+            upload_to_s3(audio, s3_key, content_type=content_type),
+            db.kaizen_jobs.insert_one({
+                "id": job_id,
+                "status": "uploading",
+                "s3_uri": f"s3://{s3_bucket_name}/{s3_key}",
+                "created_at": datetime.utcnow()
+            }),
+            return_exceptions=True
+        )
+        if isinstance(job_insert, Exception):
+            raise job_insert
+        if isinstance(s3_uri, Exception):
+            await update_job(job_id, status="failed", error=str(s3_uri))
+            raise s3_uri
         logging.info(f"Audio uploaded to S3: {s3_uri}")
         
-        # Start transcription job
-        transcription_result = await start_transcription_job(job_id, s3_uri)
-        logging.info(f"Transcription completed: {len(transcription_result)} characters")
-        
-        # Process with Bedrock Claude
-        analysis_result = await analyze_with_claude(transcription_result, meta_data)
-        logging.info(f"AI analysis completed: {analysis_result['lean_category']}")
-        
-        # Store in MongoDB
-        document_id = await store_suggestion(job_id, transcription_result, analysis_result, meta_data)
-        logging.info(f"Stored in database: {document_id}")
+        background_tasks.add_task(run_pipeline, job_id, s3_key, streaming, meta_data)
         
         return {
             "success": True,
             "job_id": job_id,
-            "document_id": document_id,
-            "transcript": transcription_result,
-            "summary": analysis_result["summary"],
-            "lean_category": analysis_result["lean_category"],
-            "suggestion_level": analysis_result["suggestion_level"],
-            "reasoning": analysis_result.get("reasoning", "")
+            "status": "queued"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Processing failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
+@api_router.get("/jobs/{job_id}", response_model=dict)
+async def get_job(job_id: str):
+    """Retrieve the status, and once completed the result, of a processing job"""
+    try:
+        job = await db.kaizen_jobs.find_one({"id": job_id}, projection={"_id": 0})
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        age = (datetime.utcnow() - job["created_at"]).total_seconds()
+        job["age_seconds"] = int(age)
+        
+        # Background tasks run in-process, so a job whose worker died never finishes on its own
+        if job["status"] not in TERMINAL_JOB_STATUSES and age > JOB_STALE_AFTER:
+            error = "Processing was abandoned before it finished, please record again"
+            await db.kaizen_jobs.update_one(
+                {"id": job_id, "status": {"$nin": list(TERMINAL_JOB_STATUSES)}},
+                {"$set": {"status": "failed", "error": error, "last_updated": datetime.utcnow()}}
+            )
+            job.update(status="failed", error=error)
+            logging.warning(f"Marked stale job {job_id} as failed after {int(age)}s")
+        
+        return job
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Failed to retrieve job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve job: {str(e)}")
+
+def suggestions_page_query(before: Optional[datetime], before_id: Optional[str]) -> dict:
+    """Keyset filter for the suggestions after (before, before_id) in newest-first order.
+
+    Timestamps only have millisecond precision, so _id breaks ties at the page boundary.
+    """
+    if before is None:
+        return {}
+    if before_id is None:
+        return {"timestamp": {"$lt": before}}
+    return {"$or": [
+        {"timestamp": {"$lt": before}},
+        {"timestamp": before, "_id": {"$lt": ObjectId(before_id)}}
+    ]}
+
+def next_page_cursor(suggestions: List[dict], limit: int) -> Optional[dict]:
+    """Query parameters for the next page, or None when this page is the last"""
+    # A short page means there is nothing older to fetch
+    if not suggestions or len(suggestions) < limit:
+        return None
+    last = suggestions[-1]
+    return {"before": last["timestamp"], "before_id": last["_id"]}
+
 @api_router.get("/suggestions", response_model=dict)
-async def get_suggestions(skip: int = 0, limit: int = 20):
-    """Retrieve stored suggestions for review"""
+async def get_suggestions(
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
+    limit: int = 20,
+    include_transcript: bool = False
+):
+    """Retrieve stored suggestions for review, newest first.
+
+    Pages are keyed on (timestamp, _id): pass the previous page's next_cursor
+    fields as the `before` and `before_id` query parameters.
+    """
     try:
         # Get total count
-        total = await db.kaizen_suggestions.count_documents({})
+        total = await db.kaizen_suggestions.estimated_document_count()
         
-        # Get suggestions with pagination
-        cursor = db.kaizen_suggestions.find().skip(skip).limit(limit).sort("timestamp", -1)
-        suggestions = await cursor.to_list(length=limit)
+        # Transcripts are large and the list view doesn't show them
+        projection = None if include_transcript else {"transcript": 0}
         
-        # Convert ObjectId to string and format dates
-        for suggestion in suggestions:
+        try:
+            query = suggestions_page_query(before, before_id)
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid before_id")
+        
+        # Get suggestions with keyset pagination on the (timestamp, _id) index
+        cursor = (
+            db.kaizen_suggestions.find(query, projection=projection)
+            .sort([("timestamp", -1), ("_id", -1)])
+            .limit(limit)
+            .batch_size(limit)
+        )
+        
+        # Convert ObjectId to string (datetimes are serialized natively)
+        suggestions = []
+        async for suggestion in cursor:
             suggestion["_id"] = str(suggestion["_id"])
-            if isinstance(suggestion.get("timestamp"), datetime):
-                suggestion["timestamp"] = suggestion["timestamp"].isoformat()
+            suggestions.append(suggestion)
             
         return {
             "suggestions": suggestions,
             "total": total,
-            "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_page_cursor(suggestions, limit)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Failed to retrieve suggestions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve suggestions: {str(e)}")
@@ -408,6 +719,115 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Unhandled errors are queued here and written to MongoDB in batches by drain_errors
+ERROR_BATCH_SIZE = 100
+ERROR_FLUSH_INTERVAL = 0.5  # seconds
+error_queue = asyncio.Queue(maxsize=10000)
+error_drain_task = None
+ERROR_DRAIN_STOP = object()  # queued on shutdown: flush the current batch and exit
+
+@app.on_event("startup")
+async def configure_thread_pool():
+    to_thread.current_default_thread_limiter().total_tokens = thread_pool_size
+
+@app.on_event("startup")
+async def startup_aws_clients():
+    global transcribe_client, bedrock_client, s3_client
+    transcribe_client = await aws_exit_stack.enter_async_context(aws_session.client('transcribe', config=aws_client_config))
+    bedrock_client = await aws_exit_stack.enter_async_context(aws_session.client('bedrock-runtime', config=aws_client_config))
+    s3_client = await aws_exit_stack.enter_async_context(aws_session.client('s3', config=aws_client_config))
+
+@app.on_event("startup")
+async def ensure_s3_bucket():
+    global BUCKET_MISSING, bucket_checked_at
+    # Create bucket if it doesn't exist (once per process, not per upload)
+    bucket_checked_at = time.monotonic()
+    BUCKET_MISSING = False
+    try:
+        await s3_client.head_bucket(Bucket=s3_bucket_name)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchBucket'):
+            # e.g. 403 for credentials without s3:ListBucket; uploads may still be allowed
+            logger.warning(f"Could not check bucket: {e}")
+            return
+        try:
+            await s3_client.create_bucket(
+                Bucket=s3_bucket_name,
+                CreateBucketConfiguration={'LocationConstraint': aws_region}
+            )
+        except Exception as e:
+            logger.warning(f"Could not create bucket: {e}")
+            BUCKET_MISSING = True
+    except Exception as e:
+        logger.warning(f"Could not check bucket: {e}")
+
+@app.on_event("startup")
+async def create_db_indexes():
+    # Unique lookup for status updates and an index backing the newest-first listing
+    try:
+        await db.kaizen_suggestions.create_index([("id", 1)], unique=True)
+        await db.kaizen_suggestions.create_index([("timestamp", -1), ("_id", -1)])
+        await db.kaizen_jobs.create_index([("id", 1)], unique=True)
+        await db.analysis_cache.create_index([("timestamp", 1)], expireAfterSeconds=ANALYSIS_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Could not create indexes: {e}")
+
+async def write_errors(batch: list):
+    try:
+        await db.errors.insert_many(batch, ordered=False)
+    except Exception as e:
+        logger.warning(f"Could not store {len(batch)} errors: {e}")
+
+async def drain_errors():
+    """Write queued errors to MongoDB in batches of up to ERROR_BATCH_SIZE or every ERROR_FLUSH_INTERVAL"""
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await error_queue.get()
+        if item is ERROR_DRAIN_STOP:
+            return
+        batch = [item]
+        stopping = False
+        deadline = loop.time() + ERROR_FLUSH_INTERVAL
+        while len(batch) < ERROR_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(error_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is ERROR_DRAIN_STOP:
+                stopping = True
+                break
+            batch.append(item)
+        await write_errors(batch)
+        if stopping:
+            return
+
+@app.on_event("startup")
+async def start_error_drain():
+    global error_drain_task
+    error_drain_task = asyncio.create_task(drain_errors())
+
+@app.on_event("shutdown")
+async def stop_error_drain():
+    # Let the drain finish its in-flight batch rather than cancelling it mid-insert
+    if error_drain_task and not error_drain_task.done():
+        await error_queue.put(ERROR_DRAIN_STOP)
+        await error_drain_task
+    # Flush whatever is still queued
+    batch = []
+    while not error_queue.empty():
+        item = error_queue.get_nowait()
+        if item is not ERROR_DRAIN_STOP:
+            batch.append(item)
+    if batch:
+        await write_errors(batch)
+
+@app.on_event("shutdown")
+async def shutdown_aws_clients():
+    await aws_exit_stack.aclose()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
@@ -417,19 +837,20 @@ async def shutdown_db_client():
 async def global_exception_handler(request, exc):
     logger.error(f"Global exception: {str(exc)}")
     
-    # Store error in MongoDB for monitoring
+    # Queue error for MongoDB monitoring, off the response path
     try:
-        await db.errors.insert_one({
+        error_queue.put_nowait({
             "error": str(exc),
             "endpoint": str(request.url),
             "method": request.method,
             "timestamp": datetime.utcnow()
         })
-    except:
-        pass  # Don't fail if error logging fails
+    except asyncio.QueueFull:
+        pass  # Drop rather than slow down or fail the response
     
-    return HTTPException(status_code=500, detail="Internal server error occurred")
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error occurred"})
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count()))
+    uvicorn.run("server:app", host="0.0.0.0", port=8001, loop="uvloop", http="httptools", workers=workers)
\ No newline at end of file
@@ -5,8 +5,9 @@ set -e
 cd /backend || { echo "Backend directory not found"; exit 1; }
 
 echo "Starting FastAPI backend"
-# Start Uvicorn with proper host binding
-uvicorn server:app --host 0.0.0.0 --port 8001 &
+# Start Uvicorn with proper host binding (uvicorn restarts workers that die).
+# nproc sees the host's CPUs, not the container's quota, so set WEB_CONCURRENCY on CPU-limited containers.
+uvicorn server:app --host 0.0.0.0 --port 8001 --workers "${WEB_CONCURRENCY:-$(nproc)}" --loop uvloop --http httptools &
 BACKEND_PID=$!
 
 echo "Waiting for backend to start..."
@@ -3,6 +3,9 @@ import { useReactMediaRecorder } from 'react-media-recorder';
 import './App.css';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+const JOB_POLL_INTERVAL_MS = 2000;
+// Comfortably above the server's 5 minute transcription cap plus analysis
+const JOB_TIMEOUT_MS = 7 * 60 * 1000;
 
 function App() {
   const [isProcessing, setIsProcessing] = useState(false);
@@ -46,12 +49,9 @@ function App() {
     try {
       const formData = new FormData();
       formData.append('audio', audioBlob, 'kaizen-recording.webm');
-      formData.append('metadata', JSON.stringify({
-        location: metadata.location || 'Production Floor',
-        shift: metadata.shift || 'Day Shift',
-        associate_name: metadata.associate_name || 'Anonymous',
-        timestamp: new Date().toISOString()
-      }));
+      formData.append('location', metadata.location || 'Production Floor');
+      formData.append('shift', metadata.shift || 'Day Shift');
+      formData.append('associate_name', metadata.associate_name || 'Anonymous');
 
       const response = await fetch(`${BACKEND_URL}/api/transcribe`, {
         method: 'POST',
@@ -63,8 +63,9 @@ function App() {
         throw new Error(errorData.detail || 'Upload failed');
       }
       
-      const data = await response.json();
-      setResult(data);
+      const { job_id } = await response.json();
+      const job = await waitForJob(job_id);
+      setResult(job.result);
       
       // Clear the form after successful submission
       clearBlobUrl();
@@ -78,6 +79,25 @@ function App() {
     }
   };
 
+  // Processing runs in the background; poll the job until it finishes
+  const waitForJob = async (jobId) => {
+    const deadline = Date.now() + JOB_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+
+      const response = await fetch(`${BACKEND_URL}/api/jobs/${jobId}`);
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || 'Failed to check processing status');
+      }
+
+      const job = await response.json();
+      if (job.status === 'completed') return job;
+      if (job.status === 'failed') throw new Error(job.error || 'Processing failed');
+    }
+    throw new Error('Processing is taking too long, please try again later');
+  };
+
   const loadSuggestions = async () => {
     try {
       const response = await fetch(`${BACKEND_URL}/api/suggestions`);
@@ -0,0 +1,364 @@
+import asyncio
+import io
+import os
+import time
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from botocore.exceptions import ClientError
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import BackgroundTasks, HTTPException, UploadFile
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from starlette.datastructures import Headers
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "kaizen_test")
+
+import server  # noqa: E402
+
+
+class TestClaudeRequestBody:
+    def test_spliced_body_matches_dict_form(self):
+        prompt = 'TRANSCRIPT: "The \\"left\\" bin is\nempty" – again\t!'
+        message = {"role": "user", "content": [{"type": "text", "text": prompt}]}
+
+        body = server.CLAUDE_BODY_PREFIX + orjson.dumps(message) + server.CLAUDE_BODY_SUFFIX
+
+        assert orjson.loads(body) == {**server.CLAUDE_REQUEST_BASE, "messages": [message]}
+
+
+class TestAnalysisCacheKey:
+    def test_ignores_case_and_whitespace(self):
+        metadata = {"location": "Line 3", "shift": "Day Shift", "associate_name": "Sam"}
+        messy = {"location": "  line 3", "shift": "DAY   shift", "associate_name": "sam "}
+
+        assert server.analysis_cache_key("Move the  bins\ncloser", metadata) == \
+            server.analysis_cache_key("move the bins closer ", messy)
+
+    def test_differs_by_transcript_and_context(self):
+        metadata = {"location": "Line 3", "associate_name": "Sam"}
+        key = server.analysis_cache_key("Move the bins closer", metadata)
+
+        assert key != server.analysis_cache_key("Move the bins further", metadata)
+        assert key != server.analysis_cache_key("Move the bins closer", {**metadata, "associate_name": "Alex"})
+        assert key != server.analysis_cache_key("Move the bins closer", {"location": "Line 3"})
+
+    def test_differs_by_model(self, monkeypatch):
+        key = server.analysis_cache_key("Move the bins closer", {})
+        monkeypatch.setattr(server, "bedrock_model_id", "anthropic.claude-3-haiku-20240307-v1:0")
+
+        assert key != server.analysis_cache_key("Move the bins closer", {})
+
+
+class FakeStream:
+    def __init__(self, data):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self.data
+
+
+class TestAnalyzeWithClaude:
+    VALID = {
+        "summary": "Move the bins closer to the line",
+        "lean_category": "Motion",
+        "suggestion_level": "Just Do It",
+        "reasoning": "Associates walk to fetch parts"
+    }
+
+    def run_analysis(self, monkeypatch, tool_input, cached=None):
+        calls = {"bedrock": 0, "cached": []}
+
+        async def invoke_model(**kwargs):
+            calls["bedrock"] += 1
+            content = [{"type": "tool_use", "name": "record_kaizen", "input": tool_input}]
+            return {"body": FakeStream(orjson.dumps({"content": content}))}
+
+        async def find_one(query):
+            return {"_id": query["_id"], "analysis": cached} if cached is not None else None
+
+        async def cache_analysis(cache_key, analysis):
+            calls["cached"].append(analysis)
+
+        monkeypatch.setattr(server, "bedrock_client", SimpleNamespace(invoke_model=invoke_model))
+        monkeypatch.setattr(server, "db", SimpleNamespace(analysis_cache=SimpleNamespace(find_one=find_one)))
+        monkeypatch.setattr(server, "cache_analysis", cache_analysis)
+
+        result = asyncio.run(server.analyze_with_claude("Move the bins closer", {"location": "Line 3"}))
+        return result, calls
+
+    def test_valid_tool_call_is_returned_and_cached(self, monkeypatch):
+        result, calls = self.run_analysis(monkeypatch, dict(self.VALID))
+
+        assert result == self.VALID
+        assert calls["cached"] == [self.VALID]
+
+    @pytest.mark.parametrize("tool_input", [
+        {k: v for k, v in VALID.items() if k != "summary"},
+        {**VALID, "lean_category": "Clutter"},
+        {**VALID, "suggestion_level": "Later"},
+        "not an object",
+    ])
+    def test_invalid_tool_call_falls_back_and_is_not_cached(self, monkeypatch, tool_input):
+        result, calls = self.run_analysis(monkeypatch, tool_input)
+
+        assert result["lean_category"] == "Motion"
+        assert result["suggestion_level"] == "Needs Review"
+        assert result["reasoning"].startswith("AI analysis unavailable")
+        assert calls["cached"] == []
+
+    def test_invalid_cache_entry_is_a_miss(self, monkeypatch):
+        result, calls = self.run_analysis(monkeypatch, dict(self.VALID), cached={"lean_category": "Motion"})
+
+        assert calls["bedrock"] == 1
+        assert result == self.VALID
+
+    def test_valid_cache_entry_skips_bedrock(self, monkeypatch):
+        result, calls = self.run_analysis(monkeypatch, {}, cached=dict(self.VALID))
+
+        assert calls["bedrock"] == 0
+        assert result == self.VALID
+
+
+class TestDrainErrors:
+    def run_drain(self, monkeypatch, scenario):
+        batches = []
+
+        async def record(batch):
+            batches.append(list(batch))
+
+        async def main():
+            monkeypatch.setattr(server, "error_queue", asyncio.Queue())
+            monkeypatch.setattr(server, "write_errors", record)
+            await scenario(batches)
+
+        asyncio.run(main())
+        return batches
+
+    def test_batches_by_size_then_interval(self, monkeypatch):
+        async def scenario(batches):
+            for i in range(250):
+                server.error_queue.put_nowait({"error": i})
+            task = asyncio.create_task(server.drain_errors())
+
+            # Full batches go out immediately, the remainder waits for the flush interval
+            await asyncio.sleep(server.ERROR_FLUSH_INTERVAL / 5)
+            assert [len(b) for b in batches] == [100, 100]
+
+            await asyncio.sleep(server.ERROR_FLUSH_INTERVAL * 1.5)
+            assert [len(b) for b in batches] == [100, 100, 50]
+            task.cancel()
+
+        batches = self.run_drain(monkeypatch, scenario)
+        assert [e["error"] for b in batches for e in b] == list(range(250))
+
+    def test_stop_flushes_partial_batch(self, monkeypatch):
+        async def scenario(batches):
+            task = asyncio.create_task(server.drain_errors())
+            for i in range(3):
+                server.error_queue.put_nowait({"error": i})
+            await asyncio.sleep(0)
+
+            await server.error_queue.put(server.ERROR_DRAIN_STOP)
+            await asyncio.wait_for(task, server.ERROR_FLUSH_INTERVAL / 2)
+
+        batches = self.run_drain(monkeypatch, scenario)
+        assert batches == [[{"error": 0}, {"error": 1}, {"error": 2}]]
+
+
+class TestSuggestionsPagination:
+    def make_page(self, count, timestamp):
+        return [{"_id": str(ObjectId()), "timestamp": timestamp} for _ in range(count)]
+
+    def test_short_page_has_no_cursor(self):
+        assert server.next_page_cursor([], 20) is None
+        assert server.next_page_cursor(self.make_page(5, datetime(2026, 10, 15)), 20) is None
+
+    def test_cursor_round_trip(self):
+        timestamp = datetime(2026, 10, 15, 8, 30, 12, 345000)
+        page = self.make_page(20, timestamp)
+
+        # Serialized as the response does, then parsed back as the next request's query parameters
+        cursor = jsonable_encoder(server.next_page_cursor(page, 20))
+        before = TypeAdapter(datetime).validate_python(cursor["before"])
+
+        assert server.suggestions_page_query(before, cursor["before_id"]) == {"$or": [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "_id": {"$lt": ObjectId(page[-1]["_id"])}}
+        ]}
+
+    def test_first_page_and_timestamp_only_queries(self):
+        timestamp = datetime(2026, 10, 15)
+
+        assert server.suggestions_page_query(None, None) == {}
+        assert server.suggestions_page_query(timestamp, None) == {"timestamp": {"$lt": timestamp}}
+
+    def test_invalid_before_id(self):
+        with pytest.raises(InvalidId):
+            server.suggestions_page_query(datetime(2026, 10, 15), "not-an-id")
+
+
+class FakeS3:
+    def __init__(self, head_error=None, create_error=None):
+        self.head_error = head_error
+        self.create_error = create_error
+        self.calls = []
+
+    async def head_bucket(self, **kwargs):
+        self.calls.append("head_bucket")
+        if self.head_error:
+            raise self.head_error
+
+    async def create_bucket(self, **kwargs):
+        self.calls.append("create_bucket")
+        if self.create_error:
+            raise self.create_error
+
+
+def client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "HeadBucket")
+
+
+def make_upload(data=b"OggS\x00\x02", filename="kaizen-recording.webm", content_type="audio/wav"):
+    # react-media-recorder labels every blob audio/wav and App.js names it .webm
+    return UploadFile(io.BytesIO(data), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+class TestBucketCheck:
+    def check(self, monkeypatch, s3):
+        monkeypatch.setattr(server, "s3_client", s3)
+        asyncio.run(server.ensure_s3_bucket())
+        return server.BUCKET_MISSING
+
+    @pytest.mark.parametrize("head_error", [None, client_error("403"), ConnectionError("timed out")])
+    def test_existing_or_unknown_bucket_does_not_block_uploads(self, monkeypatch, head_error):
+        s3 = FakeS3(head_error=head_error)
+
+        assert self.check(monkeypatch, s3) is False
+        assert s3.calls == ["head_bucket"]
+
+    def test_missing_bucket_is_created(self, monkeypatch):
+        s3 = FakeS3(head_error=client_error("404"))
+
+        assert self.check(monkeypatch, s3) is False
+        assert s3.calls == ["head_bucket", "create_bucket"]
+
+    def test_missing_bucket_that_cannot_be_created(self, monkeypatch):
+        s3 = FakeS3(head_error=client_error("404"), create_error=client_error("403"))
+
+        assert self.check(monkeypatch, s3) is True
+
+    def submit(self, monkeypatch, s3, checked_ago):
+        monkeypatch.setattr(server, "s3_client", s3)
+        monkeypatch.setattr(server, "BUCKET_MISSING", True)
+        monkeypatch.setattr(server, "bucket_checked_at", time.monotonic() - checked_ago)
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(server.process_voice_recording(
+                BackgroundTasks(), audio=make_upload(), location=None, shift=None, associate_name=None
+            ))
+        return exc_info.value
+
+    def test_missing_bucket_fails_fast_without_aws_call(self, monkeypatch):
+        s3 = FakeS3()
+
+        error = self.submit(monkeypatch, s3, checked_ago=1)
+
+        assert error.status_code == 503
+        assert s3.calls == []
+
+    def test_missing_bucket_is_rechecked_after_interval(self, monkeypatch):
+        s3 = FakeS3(head_error=client_error("404"), create_error=client_error("403"))
+
+        error = self.submit(monkeypatch, s3, checked_ago=server.BUCKET_RECHECK_INTERVAL + 1)
+
+        assert error.status_code == 503
+        assert s3.calls == ["head_bucket", "create_bucket"]
+
+
+class FakeJobs:
+    def __init__(self, job):
+        self.job = job
+        self.updates = []
+
+    async def find_one(self, query, projection=None):
+        return dict(self.job) if self.job and self.job["id"] == query["id"] else None
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+
+
+class TestGetJob:
+    def get(self, monkeypatch, status, age, job_id="kaizen_1234abcd"):
+        jobs = FakeJobs({
+            "id": "kaizen_1234abcd",
+            "status": status,
+            "created_at": datetime.utcnow() - timedelta(seconds=age)
+        })
+        monkeypatch.setattr(server, "db", SimpleNamespace(kaizen_jobs=jobs))
+        return asyncio.run(server.get_job(job_id)), jobs.updates
+
+    def test_stale_unfinished_job_is_marked_failed(self, monkeypatch):
+        job, updates = self.get(monkeypatch, "transcribing", server.JOB_STALE_AFTER + 5)
+
+        assert job["status"] == "failed"
+        assert job["error"]
+        assert job["age_seconds"] >= server.JOB_STALE_AFTER
+        # Only applied if the job hasn't finished in the meantime
+        [(query, update)] = updates
+        assert query == {"id": "kaizen_1234abcd", "status": {"$nin": ["completed", "failed"]}}
+        assert update["$set"]["status"] == "failed"
+
+    def test_recent_unfinished_job_is_left_alone(self, monkeypatch):
+        job, updates = self.get(monkeypatch, "analyzing", 30)
+
+        assert job["status"] == "analyzing"
+        assert job["age_seconds"] == 30
+        assert updates == []
+
+    @pytest.mark.parametrize("status", ["completed", "failed"])
+    def test_finished_jobs_are_never_marked_stale(self, monkeypatch, status):
+        job, updates = self.get(monkeypatch, status, server.JOB_STALE_AFTER * 10)
+
+        assert job["status"] == status
+        assert updates == []
+
+    def test_unknown_job(self, monkeypatch):
+        with pytest.raises(HTTPException) as exc_info:
+            self.get(monkeypatch, "queued", 0, job_id="kaizen_missing")
+
+        assert exc_info.value.status_code == 404
+
+
+class TestIsStreamable:
+    @pytest.mark.parametrize("data, expected", [
+        (b"OggS\x00\x02rest-of-page", True),
+        (b"\x1aE\xdf\xa3webm-header", False),
+        (b"RIFF\x24\x00\x00\x00WAVE", False),
+        (b"Ogg", False),
+        (b"", False),
+    ])
+    def test_detects_ogg_by_magic_bytes(self, data, expected):
+        async def check():
+            upload = make_upload(data)
+            streamable = await server.is_streamable(upload)
+            return streamable, await upload.read()
+
+        streamable, remaining = asyncio.run(check())
+
+        assert streamable is expected
+        # The file is rewound so the S3 upload gets every byte
+        assert remaining == data